@@ -0,0 +1,145 @@
+"""
+Compare peak RSS of the per-sample grammar data before and after compaction
+on a synthetic run.
+
+Two scenarios are measured, each mode in a fresh subprocess so the peak RSS
+readings are independent:
+
+- features: the per-row grammar_features dicts analyze_transcriptions keeps,
+  with per-row key strings (before) versus interned keys (after). The
+  DataFrame is copied twice, as analyze_transcriptions and score_samples do.
+- errors: a caller that keeps analyze_grammar()['errors'] for every sample,
+  holding LanguageTool Match objects (before) versus GrammarError records
+  (after). analyze_transcriptions itself discards the errors, so this saving
+  only applies to such callers.
+
+No NLTK data or LanguageTool server is needed: the "matches" mode builds
+objects shaped like language_tool_python Matches (message, replacements,
+context, sentence) and the feature dicts mirror get_grammar_features' keys.
+
+Usage:
+    python benchmarks/memory_usage.py [--samples 100000] [--errors 3]
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grammar_scoring.error_records import GrammarError
+
+RULES = [
+    ('MORFOLOGIK_RULE_EN_US', 'TYPOS'),
+    ('UPPERCASE_SENTENCE_START', 'CASING'),
+    ('HE_VERB_AGR', 'GRAMMAR'),
+    ('EN_A_VS_AN', 'MISC'),
+    ('COMMA_PARENTHESIS_WHITESPACE', 'TYPOGRAPHY'),
+    ('ENGLISH_WORD_REPEAT_RULE', 'MISC'),
+]
+
+POS_TAGS = ['CC', 'CD', 'DT', 'EX', 'IN', 'JJ', 'JJR', 'MD', 'NN', 'NNS', 'NNP', 'PDT', 'POS', 'PRP',
+            'PRP$', 'RB', 'RBR', 'RP', 'TO', 'UH', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ', 'WDT', 'WP', 'WRB']
+DEP_LABELS = ['ROOT', 'acomp', 'advcl', 'advmod', 'amod', 'aux', 'cc', 'ccomp', 'conj', 'det', 'dobj',
+              'intj', 'mark', 'neg', 'nsubj', 'nummod', 'pobj', 'poss', 'prep', 'prt', 'punct', 'xcomp']
+
+MODES = {
+    'features': ('features', 'Feature dicts with per-row keys'),
+    'interned_features': ('features', 'Feature dicts with interned keys'),
+    'matches': ('errors', 'Retained Match objects'),
+    'records': ('errors', 'Retained GrammarError records'),
+}
+
+class FakeMatch:
+    """Stand-in for language_tool_python.Match with the same per-match payload."""
+
+    def __init__(self, rule_id, category, offset, length, sentence):
+        self.rule_id = rule_id
+        self.category = category
+        self.offset = offset
+        self.error_length = length
+        self.message = f"Possible error found by rule {rule_id}."
+        self.replacements = [f"suggestion{i}_{offset}" for i in range(5)]
+        self.offset_in_context = min(offset, 40)
+        self.context = sentence[max(0, offset - 40):offset + 40]
+        self.sentence = sentence
+        self.rule_issue_type = category.lower()
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def build_features(rng, intern):
+    """Build a grammar_features dict shaped like get_grammar_features output."""
+    word_count = rng.randint(20, 120)
+    features = {
+        'word_count': word_count,
+        'sentence_count': rng.randint(1, 8),
+        'avg_sentence_length': word_count / 4,
+        'error_rate': rng.random() / 10,
+        'error_count': rng.randint(0, 5)
+    }
+    labels = rng.sample(POS_TAGS, 18) + rng.sample(DEP_LABELS, 16)
+    for label in labels:
+        key = f'{label}_ratio'
+        features[sys.intern(key) if intern else key] = rng.random()
+    return features
+
+def build_errors(rng, i, errors_per_sample, compact):
+    """Build the error list analyze_grammar returns for one sample."""
+    sentence = f"this is synthetic transcription number {i} with a few mistake in it " * 2
+    errors = []
+    for _ in range(errors_per_sample):
+        rule_id, category = rng.choice(RULES)
+        # Build fresh strings, as a JSON response would, so interning matters
+        rule_id, category = ''.join(rule_id), ''.join(category)
+        offset = rng.randrange(len(sentence) - 10)
+        match = FakeMatch(rule_id, category, offset, rng.randint(1, 10), sentence)
+        errors.append(GrammarError.from_match(match) if compact else match)
+    return errors
+
+def run(mode, samples, errors_per_sample):
+    """Build and retain per-sample data for one mode, returning peak RSS in MB."""
+    rng = random.Random(42)
+    if MODES[mode][0] == 'features':
+        df = pd.DataFrame({'transcription': ['synthetic transcription'] * samples})
+        df['grammar_features'] = [build_features(rng, mode == 'interned_features') for _ in range(samples)]
+        # analyze_transcriptions and score_samples each copy the DataFrame
+        copies = [df.copy(), df.copy()]
+    else:
+        retained = [build_errors(rng, i, errors_per_sample, mode == 'records') for i in range(samples)]
+    return peak_rss_mb()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--errors', type=int, default=3, help='Errors per sample')
+    parser.add_argument('--mode', choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(run(args.mode, args.samples, args.errors))
+        return
+
+    peaks = {}
+    for mode in MODES:
+        output = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__),
+            '--mode', mode, '--samples', str(args.samples), '--errors', str(args.errors)
+        ])
+        peaks[mode] = float(output.decode().strip())
+
+    print(f"Samples: {args.samples}, errors per sample: {args.errors}")
+    for before, after in (('features', 'interned_features'), ('matches', 'records')):
+        print(f"{MODES[before][1] + ':':36} {peaks[before]:.1f} MB")
+        print(f"{MODES[after][1] + ':':36} {peaks[after]:.1f} MB")
+        print(f"{'Reduction:':36} {1 - peaks[after] / peaks[before]:.1%}")
+
+if __name__ == '__main__':
+    main()
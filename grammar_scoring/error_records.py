@@ -0,0 +1,32 @@
+import sys
+
+class GrammarError:
+    """Compact record of a single grammar error.
+
+    Keeps only what the pipeline needs from a LanguageTool Match, so that
+    replacement lists and context strings are not retained per sample.
+    Rule ids and categories repeat across samples and are interned.
+    """
+    __slots__ = ('offset', 'length', 'rule_id', 'category', 'message')
+
+    def __init__(self, offset, length, rule_id, category, message=''):
+        self.offset = offset
+        self.length = length
+        self.rule_id = sys.intern(rule_id or '')
+        self.category = sys.intern(category or '')
+        self.message = message or ''
+
+    @classmethod
+    def from_match(cls, match):
+        """Build a record from a language_tool_python Match."""
+        # Older language_tool_python releases use camelCase attribute names
+        length = getattr(match, 'error_length', None)
+        if length is None:
+            length = getattr(match, 'errorLength', 0)
+        rule_id = getattr(match, 'rule_id', None) or getattr(match, 'ruleId', '')
+        return cls(match.offset, length, rule_id,
+                   getattr(match, 'category', ''), getattr(match, 'message', ''))
+
+    def __repr__(self):
+        return (f"GrammarError(offset={self.offset}, length={self.length}, "
+                f"rule_id={self.rule_id!r}, category={self.category!r})")
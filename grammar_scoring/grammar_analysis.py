@@ -1,11 +1,15 @@
 import language_tool_python
 import nltk
 from nltk.tokenize import word_tokenize, sent_tokenize
-import spacy
+import sys
+import numpy as np
 import pandas as pd
 from tqdm.notebook import tqdm
 import os
 
+from .error_records import GrammarError
+from .scoring import calculate_grammar_score
+
 # Initialize tools
 try:
     tool = language_tool_python.LanguageTool('en-US')
@@ -14,11 +18,22 @@ except:
     print("Warning: LanguageTool could not be initialized. Grammar checking may be limited.")
 
 try:
+    import spacy
     nlp = spacy.load("en_core_web_sm")
 except:
     nlp = None
     print("Warning: spaCy model could not be loaded.")
 
+# Pronouns whose following present-tense verb must agree in number
+SINGULAR_PRONOUNS = {'he', 'she', 'it'}
+PLURAL_PRONOUNS = {'i', 'you', 'we', 'they'}
+# Words whose article does not follow their first letter
+AN_WORDS = {'hour', 'honest', 'honor', 'heir'}
+A_WORDS = {'unit', 'user', 'one', 'university', 'european'}
+# Tags the pre-screen rules inspect; texts with few of them are left to LanguageTool
+RULE_TAGS = {'DT', 'PRP', 'MD', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ'}
+MIN_RULE_COVERAGE = 0.2
+
 def analyze_grammar(text):
     """Analyze grammar using LanguageTool."""
     if not text or not tool:
@@ -30,13 +45,14 @@ def analyze_grammar(text):
             'error_rate': 0
         }
     
-    matches = tool.check(text)
+    # Convert matches right away so the full Match objects can be freed
+    errors = [GrammarError.from_match(match) for match in tool.check(text)]
     
     word_count = len(word_tokenize(text))
     
     error_categories = {}
-    for match in matches:
-        category = match.category
+    for error in errors:
+        category = error.category
         if category in error_categories:
             error_categories[category] += 1
         else:
@@ -44,14 +60,84 @@ def analyze_grammar(text):
     
     return {
         'text': text,
-        'error_count': len(matches),
-        'errors': matches,
+        'error_count': len(errors),
+        'errors': errors,
         'error_categories': error_categories,
-        'error_rate': len(matches) / max(word_count, 1)  
+        'error_rate': len(errors) / max(word_count, 1)  
     }
 
-def get_grammar_features(text):
-    """Extract linguistic features from text."""
+def prescreen_grammar(text, words=None, pos_tags=None):
+    """Cheap rule-based grammar check using NLTK POS tags.
+
+    Flags texts with obvious errors and marks texts the rules cannot judge
+    reliably as ambiguous, so only those need a full LanguageTool check.
+    Only signals present in unpunctuated, lowercase ASR output (such as
+    Google Speech Recognition results) are used to decide ambiguity.
+    """
+    text = text.strip() if text else ''
+    if not text:
+        return {'issue_count': 0, 'error_rate': 0, 'flagged': False, 'ambiguous': False}
+    
+    if words is None:
+        words = word_tokenize(text)
+    if pos_tags is None:
+        pos_tags = nltk.pos_tag(words)
+    
+    word_count = len(words)
+    issue_count = 0
+    
+    for (word, tag), (next_word, next_tag) in zip(pos_tags, pos_tags[1:]):
+        lower, next_lower = word.lower(), next_word.lower()
+        
+        # Repeated word ("the the")
+        if lower == next_lower and word.isalpha():
+            issue_count += 1
+        # Article mismatch ("a apple", "an dog")
+        elif lower in ('a', 'an') and next_word[:1].isalpha():
+            if next_lower in AN_WORDS:
+                expected = 'an'
+            elif next_lower in A_WORDS:
+                expected = 'a'
+            else:
+                expected = 'an' if next_lower[0] in 'aeiou' else 'a'
+            if lower != expected:
+                issue_count += 1
+        # Subject-verb agreement ("he go", "they goes")
+        elif lower in SINGULAR_PRONOUNS and next_tag == 'VBP':
+            issue_count += 1
+        elif lower in PLURAL_PRONOUNS and next_tag == 'VBZ':
+            issue_count += 1
+        # Two determiners in a row ("the a")
+        elif tag == 'DT' and next_tag == 'DT' and lower != 'all':
+            issue_count += 1
+    
+    # Lowercase standalone "i", only meaningful when the transcriber punctuates
+    if text[-1] in '.!?':
+        issue_count += sum(1 for word in words if word == 'i')
+    
+    # Cases the rules cannot judge: foreign words, fillers, verbless
+    # fragments and texts with few tokens the rules look at
+    tags = [tag for _, tag in pos_tags]
+    rule_coverage = sum(1 for tag in tags if tag in RULE_TAGS) / max(len(tags), 1)
+    ambiguous = (
+        any(tag in ('FW', 'UH') for tag in tags)
+        or not any(tag.startswith('VB') for tag in tags)
+        or rule_coverage < MIN_RULE_COVERAGE
+    )
+    
+    return {
+        'issue_count': issue_count,
+        'error_rate': issue_count / max(word_count, 1),
+        'flagged': issue_count > 0,
+        'ambiguous': ambiguous
+    }
+
+def get_grammar_features(text, use_prescreen=False, audit=False):
+    """Extract linguistic features from text.
+    
+    With use_prescreen, LanguageTool only runs when the pre-screen flags the
+    text, finds it ambiguous, or the text is selected for audit.
+    """
     if not text:
         return {}
     
@@ -70,10 +156,23 @@ def get_grammar_features(text):
         else:
             pos_counts[tag] = 1
     
-    pos_ratios = {f'{pos}_ratio': count / max(word_count, 1) for pos, count in pos_counts.items()}
+    # Keys are interned so rows share them instead of each holding copies
+    pos_ratios = {sys.intern(f'{pos}_ratio'): count / max(word_count, 1) for pos, count in pos_counts.items()}
     
     # Grammar analysis
-    grammar_analysis = analyze_grammar(text)
+    escalated = True
+    prescreen = None
+    if use_prescreen:
+        prescreen = prescreen_grammar(text, words, pos_tags)
+        escalated = audit or prescreen['flagged'] or prescreen['ambiguous']
+    
+    if escalated:
+        grammar_analysis = analyze_grammar(text)
+    else:
+        grammar_analysis = {
+            'error_count': prescreen['issue_count'],
+            'error_rate': prescreen['error_rate']
+        }
     error_rate = grammar_analysis['error_rate']
     
     features = {
@@ -84,6 +183,15 @@ def get_grammar_features(text):
         'error_count': grammar_analysis['error_count']
     }
     
+    if prescreen is not None:
+        # Kept apart from the linguistic features so they stay usable as a feature vector
+        features['tiered'] = {
+            'escalated': escalated,
+            'audited': audit and not (prescreen['flagged'] or prescreen['ambiguous']),
+            'prescreen_error_count': prescreen['issue_count'],
+            'prescreen_error_rate': prescreen['error_rate']
+        }
+    
     features.update(pos_ratios)
     
     # Optional spaCy analysis
@@ -98,7 +206,7 @@ def get_grammar_features(text):
                 else:
                     dep_counts[token.dep_] = 1
             
-            dep_ratios = {f'{dep}_ratio': count / max(word_count, 1) 
+            dep_ratios = {sys.intern(f'{dep}_ratio'): count / max(word_count, 1) 
                           for dep, count in dep_counts.items()}
             
             features.update(dep_ratios)
@@ -107,8 +215,81 @@ def get_grammar_features(text):
     
     return features
 
-def analyze_transcriptions(df, text_column='transcription'):
-    """Analyze grammar for multiple transcriptions."""
+def summarize_tiered_check(results, text_column='transcription'):
+    """Report escalation rate and deviation from full LanguageTool checking.
+    
+    Audited texts passed the pre-screen but were checked anyway. Their
+    pre-screen error rate is always 0, so the audit only measures false
+    negatives: how often, and by how much, texts that were never escalated
+    would have scored differently under LanguageTool. Flagged texts have
+    both results, so the gap between them is reported separately.
+    """
+    rows = []
+    for idx, features in results['grammar_features'].items():
+        if not isinstance(features, dict) or 'tiered' not in features:
+            continue
+        tiered = features['tiered']
+        text_length = len(results.at[idx, text_column])
+        rows.append({
+            'escalated': tiered['escalated'],
+            'audited': tiered['audited'],
+            'flagged': tiered['prescreen_error_count'] > 0,
+            'error_rate': features['error_rate'],
+            'prescreen_error_rate': tiered['prescreen_error_rate'],
+            'grammar_score': calculate_grammar_score(features['error_rate'], text_length),
+            'prescreen_grammar_score': calculate_grammar_score(tiered['prescreen_error_rate'], text_length)
+        })
+    
+    checked = pd.DataFrame(rows)
+    if checked.empty:
+        return {'checked': 0, 'escalation_rate': 0.0, 'audited': 0}
+    
+    audited = checked[checked['audited']]
+    summary = {
+        'checked': len(checked),
+        'escalation_rate': checked['escalated'].mean(),
+        'audited': len(audited)
+    }
+    
+    if not audited.empty:
+        score_diff = (audited['grammar_score'] - audited['prescreen_grammar_score']).abs()
+        summary.update({
+            'audit_miss_rate': (audited['error_rate'] > 0).mean(),
+            'audit_error_rate_mae': audited['error_rate'].mean(),
+            'audit_grammar_score_mae': score_diff.mean(),
+            'audit_grammar_score_max_diff': score_diff.max()
+        })
+    
+    flagged = checked[checked['flagged']]
+    summary['flagged'] = len(flagged)
+    if not flagged.empty:
+        error_rate_diff = (flagged['error_rate'] - flagged['prescreen_error_rate']).abs()
+        score_diff = (flagged['grammar_score'] - flagged['prescreen_grammar_score']).abs()
+        summary.update({
+            'flagged_error_rate_mae': error_rate_diff.mean(),
+            'flagged_grammar_score_mae': score_diff.mean()
+        })
+    
+    return summary
+
+def analyze_transcriptions(df, text_column='transcription', tiered=False, audit_rate=0.1, random_state=42):
+    """Analyze grammar for multiple transcriptions.
+    
+    Args:
+        df: DataFrame with transcriptions
+        text_column: Column holding the text to analyze
+        tiered: Pre-screen texts and only run LanguageTool on flagged,
+            ambiguous or audited ones
+        audit_rate: Fraction of texts passing the pre-screen that are still
+            checked with LanguageTool to measure the pre-screen's accuracy
+        random_state: Seed for selecting audited texts
+        
+    Returns:
+        DataFrame with grammar columns. In tiered mode a 'grammar_escalated'
+        column marks rows scored by LanguageTool (False rows carry the
+        pre-screen's approximate error rate) and the summary from
+        summarize_tiered_check is stored in results.attrs['tiered_check']
+    """
     if 'transcription' not in df.columns:
         print("No transcription column found")
         return df
@@ -119,6 +300,10 @@ def analyze_transcriptions(df, text_column='transcription'):
     results['grammar_features'] = None
     results['error_count'] = 0
     results['error_rate'] = 0.0
+    if tiered:
+        results['grammar_escalated'] = False
+    
+    rng = np.random.default_rng(random_state)
     
     for idx, row in tqdm(results.iterrows(), total=len(results), desc="Analyzing grammar"):
         text = row[text_column]
@@ -127,11 +312,25 @@ def analyze_transcriptions(df, text_column='transcription'):
             continue
             
         # Get grammar features
-        features = get_grammar_features(text)
+        if tiered:
+            features = get_grammar_features(text, use_prescreen=True, audit=rng.random() < audit_rate)
+        else:
+            features = get_grammar_features(text)
         
         # Update DataFrame
         results.at[idx, 'grammar_features'] = features
         results.at[idx, 'error_count'] = features.get('error_count', 0)
         results.at[idx, 'error_rate'] = features.get('error_rate', 0.0)
+        if tiered:
+            results.at[idx, 'grammar_escalated'] = features['tiered']['escalated']
+    
+    if tiered:
+        summary = summarize_tiered_check(results, text_column)
+        results.attrs['tiered_check'] = summary
+        print(f"Escalated {summary['escalation_rate']:.1%} of {summary['checked']} texts to LanguageTool")
+        if summary['audited']:
+            print(f"Audit of {summary['audited']} pre-screened texts: "
+                  f"{summary['audit_miss_rate']:.1%} had LanguageTool errors, "
+                  f"grammar score MAE {summary['audit_grammar_score_mae']:.2f}")
     
     return results
\ No newline at end of file
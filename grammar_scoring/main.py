@@ -66,7 +66,8 @@ def process_single_audio(audio_file, use_whisper=False):
     
     return result
 
-def complete_grammar_scoring_workflow(dataset_name=None, audio_file=None, use_whisper=False):
+def complete_grammar_scoring_workflow(dataset_name=None, audio_file=None, use_whisper=False, tiered_grammar_check=False,
+                                      audit_rate=0.1):
     """
     Complete workflow for grammar scoring.
     
@@ -74,6 +75,10 @@ def complete_grammar_scoring_workflow(dataset_name=None, audio_file=None, use_wh
         dataset_name: Path to dataset folder
         audio_file: Path to single audio file
         use_whisper: Whether to use Whisper for transcription
+        tiered_grammar_check: Whether to pre-screen dataset transcriptions and
+            only run LanguageTool on flagged, ambiguous or audited ones
+        audit_rate: Fraction of pre-screened transcriptions still checked with
+            LanguageTool when tiered_grammar_check is set
         
     Returns:
         DataFrame with results or single result dictionary
@@ -114,7 +119,7 @@ def complete_grammar_scoring_workflow(dataset_name=None, audio_file=None, use_wh
         df = process_audio_files(df, use_whisper=use_whisper)
         
         # Analyze grammar
-        df = analyze_transcriptions(df)
+        df = analyze_transcriptions(df, tiered=tiered_grammar_check, audit_rate=audit_rate)
         
         # Calculate scores
         df = score_samples(df)
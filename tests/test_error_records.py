@@ -0,0 +1,31 @@
+from grammar_scoring.error_records import GrammarError
+
+class FakeMatch:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+def test_from_match_keeps_compact_fields():
+    match = FakeMatch(offset=3, error_length=2, rule_id='HE_VERB_AGR', category='GRAMMAR',
+                      message='The pronoun does not agree with the verb.', replacements=['goes'],
+                      context='He go to school.')
+
+    error = GrammarError.from_match(match)
+
+    assert (error.offset, error.length, error.rule_id, error.category) == (3, 2, 'HE_VERB_AGR', 'GRAMMAR')
+    assert error.message == 'The pronoun does not agree with the verb.'
+    assert not hasattr(error, 'replacements')
+    assert not hasattr(error, '__dict__')
+
+def test_from_match_falls_back_to_camel_case():
+    match = FakeMatch(offset=0, errorLength=4, ruleId='EN_A_VS_AN')
+
+    error = GrammarError.from_match(match)
+
+    assert (error.length, error.rule_id, error.category, error.message) == (4, 'EN_A_VS_AN', '', '')
+
+def test_repeated_strings_are_interned():
+    first = GrammarError(0, 1, ''.join('HE_VERB_AGR'), ''.join('GRAMMAR'))
+    second = GrammarError(5, 1, ''.join('HE_VERB_AGR'), ''.join('GRAMMAR'))
+
+    assert first.rule_id is second.rule_id
+    assert first.category is second.category
@@ -0,0 +1,121 @@
+import re
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('nltk')
+pytest.importorskip('language_tool_python')
+
+from grammar_scoring import grammar_analysis
+
+# Small fixed tagger so the tests do not need NLTK data or a LanguageTool server
+TAGS = {
+    'he': 'PRP', 'she': 'PRP', 'they': 'PRP', 'i': 'PRP',
+    'go': 'VBP', 'waited': 'VBD', 'walk': 'VBP', 'have': 'VBP', 'think': 'VBP', 'reads': 'VBZ', 'goes': 'VBZ',
+    'the': 'DT', 'a': 'DT', 'an': 'DT', 'so': 'RB', 'uh': 'UH',
+    'to': 'TO', 'school': 'NN', 'dog': 'NN', 'book': 'NN', 'park': 'NN', 'apple': 'NN',
+    '.': '.',
+}
+
+def tokenize(text):
+    return re.findall(r"\w+|[^\w\s]", text)
+
+def pos_tag(words):
+    return [(word, TAGS.get(word.lower(), 'NN')) for word in words]
+
+def tagged(text):
+    words = tokenize(text)
+    return words, pos_tag(words)
+
+class FakeMatch:
+    def __init__(self, offset):
+        self.offset = offset
+        self.error_length = 2
+        self.rule_id = 'FAKE_RULE'
+        self.category = 'GRAMMAR'
+        self.message = 'Fake error.'
+
+class FakeTool:
+    """Reports one error per text and records which texts were checked."""
+
+    def __init__(self):
+        self.checked = []
+
+    def check(self, text):
+        self.checked.append(text)
+        return [FakeMatch(0)]
+
+@pytest.fixture
+def fake_tool(monkeypatch):
+    tool = FakeTool()
+    monkeypatch.setattr(grammar_analysis, 'tool', tool)
+    monkeypatch.setattr(grammar_analysis, 'nlp', None)
+    monkeypatch.setattr(grammar_analysis, 'word_tokenize', tokenize)
+    monkeypatch.setattr(grammar_analysis, 'sent_tokenize', lambda text: [text])
+    monkeypatch.setattr(grammar_analysis.nltk, 'pos_tag', pos_tag)
+    return tool
+
+@pytest.mark.parametrize('text', [
+    'He go to school.',
+    'They goes to school.',
+    'I have an dog.',
+    'I have a apple.',
+    'I waited a hour.',
+    'She goes to an university.',
+    'She reads the a book.',
+    'They walk to the the park.',
+])
+def test_prescreen_flags_rule_errors(text):
+    result = grammar_analysis.prescreen_grammar(text, *tagged(text))
+    assert result['flagged']
+    assert result['issue_count'] == 1
+
+@pytest.mark.parametrize('text', [
+    'They walk to the park.',
+    'they walk to the park',
+    'i walk to the park',
+    'i waited an hour',
+    'she goes to a university',
+])
+def test_prescreen_passes_clean_asr_output(text):
+    result = grammar_analysis.prescreen_grammar(text, *tagged(text))
+    assert not result['flagged']
+    assert not result['ambiguous']
+
+@pytest.mark.parametrize('text', ['uh i think so', 'the dog', '   '])
+def test_prescreen_ambiguity(text):
+    result = grammar_analysis.prescreen_grammar(text, *tagged(text))
+    assert result['ambiguous'] == bool(text.strip())
+    assert not result['flagged']
+
+def test_tiered_analysis_escalates_flagged_and_ambiguous(fake_tool):
+    df = pd.DataFrame({'transcription': [
+        'he go to school', 'they walk to the park', 'she reads the book', 'uh i think so', None
+    ]})
+
+    results = grammar_analysis.analyze_transcriptions(df, tiered=True, audit_rate=0)
+
+    assert fake_tool.checked == ['he go to school', 'uh i think so']
+    assert results['grammar_escalated'].tolist() == [True, False, False, True, False]
+    assert results['error_count'].tolist() == [1, 0, 0, 1, 0]
+    features = results.at[1, 'grammar_features']
+    assert features['tiered'] == {'escalated': False, 'audited': False,
+                                  'prescreen_error_count': 0, 'prescreen_error_rate': 0.0}
+    assert 'escalated' not in features
+    summary = results.attrs['tiered_check']
+    assert summary['checked'] == 4
+    assert summary['escalation_rate'] == 0.5
+    assert summary['audited'] == 0
+    assert summary['flagged'] == 1
+
+def test_tiered_analysis_audits_passed_texts(fake_tool):
+    df = pd.DataFrame({'transcription': ['he go to school', 'they walk to the park', 'she reads the book']})
+
+    results = grammar_analysis.analyze_transcriptions(df, tiered=True, audit_rate=1)
+
+    assert len(fake_tool.checked) == 3
+    assert results['grammar_escalated'].all()
+    summary = results.attrs['tiered_check']
+    assert summary['audited'] == 2
+    assert summary['audit_miss_rate'] == 1.0
+    assert summary['audit_grammar_score_mae'] > 0